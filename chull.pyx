@@ -0,0 +1,57 @@
+# cython: language_level=3
+"""Cython build of the monotone-chain kernel used by :mod:`convex_hull`.
+
+It is only picked up when Numba is not installed. Build it in place with::
+
+    python setup.py build_ext --inplace
+"""
+cimport cython
+
+import numpy as np
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef Py_ssize_t _chain(
+    const double[:, ::1] pts, long long[::1] out, bint lower
+) noexcept nogil:
+    """Write one half of the hull of ``pts`` into ``out`` and return its length.
+
+    ``lower`` walks the sorted points forwards (lower hull); otherwise they
+    are walked backwards (upper hull).
+    """
+    cdef Py_ssize_t n = pts.shape[0]
+    cdef Py_ssize_t k = 0
+    cdef Py_ssize_t i, j, o, a
+    for j in range(n):
+        i = j if lower else n - 1 - j
+        while k >= 2:
+            o = out[k - 2]
+            a = out[k - 1]
+            if (pts[a, 0] - pts[o, 0]) * (pts[i, 1] - pts[o, 1]) - (
+                pts[a, 1] - pts[o, 1]
+            ) * (pts[i, 0] - pts[o, 0]) > 0:
+                break
+            k -= 1
+        out[k] = i
+        k += 1
+    return k
+
+
+def monotone_chain(pts):
+    """Return indices into the sorted, unique ``(N, 2)`` array ``pts`` of its hull.
+
+    Same contract as :func:`convex_hull._monotone_chain`: counter-clockwise
+    order without repeating the first point at the end.
+    """
+    cdef const double[:, ::1] view = np.ascontiguousarray(pts, dtype=np.float64)
+    cdef Py_ssize_t n = view.shape[0]
+    lower = np.empty(n, np.int64)
+    upper = np.empty(n, np.int64)
+    cdef long long[::1] lower_view = lower
+    cdef long long[::1] upper_view = upper
+    cdef Py_ssize_t nlow, nup
+    with nogil:
+        nlow = _chain(view, lower_view, True)
+        nup = _chain(view, upper_view, False)
+    return np.concatenate((lower[: nlow - 1], upper[: nup - 1]))
@@ -1,105 +1,292 @@
-import random
+import matplotlib
+
+matplotlib.use("Agg")
 
 import matplotlib.pyplot as plt
+import numpy as np
+from numpy.typing import ArrayLike
 
+try:
+    from numba import njit, vectorize
 
-def _cross(
-    o: tuple[float, float], a: tuple[float, float], b: tuple[float, float]
-) -> float:
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    # Without Numba the kernels below run as plain Python/NumPy functions
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+    def vectorize(*args, **kwargs):
+        return lambda func: func
+
+
+@njit(cache=True)
+def _cross(o0: float, o1: float, a0: float, a1: float, b0: float, b1: float) -> float:
     """2D cross product of OA and OB vectors (z-component).
 
     Positive if OAB makes a counter-clockwise turn, negative for clockwise,
     and zero if the points are collinear.
     """
-    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+    return (a0 - o0) * (b1 - o1) - (a1 - o1) * (b0 - o0)
 
 
-def compute_convex_hull(
-    points: list[tuple[float, float]],
-) -> list[tuple[float, float]]:
-    """Compute the convex hull of a set of 2D points using Andrew's monotone chain.
+@vectorize(
+    ["float64(float64, float64, float64, float64, float64, float64)"], cache=True
+)
+def _cross_batch(
+    ox: float, oy: float, ax: float, ay: float, bx: float, by: float
+) -> float:
+    """Elementwise :func:`_cross` as a ufunc, broadcasting over point arrays.
 
-    Returns the hull vertices in counter-clockwise order without repeating
-    the first point at the end. If there are fewer than 3 unique points,
-    the returned list is the unique points themselves.
+    Evaluated in a single fused loop, so batched orientation tests do not
+    allocate the intermediate differences and products NumPy would.
     """
-    # Remove duplicates and sort lexicographically (by x, then y)
-    unique_points = sorted(set(points))
-    if len(unique_points) <= 1:
-        return unique_points
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+@njit(cache=True)
+def _monotone_chain_nb(pts: np.ndarray) -> np.ndarray:
+    """Return indices into the sorted, unique ``(N, 2)`` array ``pts`` of its hull.
+
+    The indices are in counter-clockwise order without repeating the first
+    point at the end.
+    """
+    n = pts.shape[0]
+
+    # Build lower hull
+    lower = np.empty(n, np.int64)
+    nlow = 0
+    for i in range(n):
+        while nlow >= 2:
+            turn = _cross(
+                pts[lower[nlow - 2], 0],
+                pts[lower[nlow - 2], 1],
+                pts[lower[nlow - 1], 0],
+                pts[lower[nlow - 1], 1],
+                pts[i, 0],
+                pts[i, 1],
+            )
+            if turn > 0.0:
+                break
+            nlow -= 1
+        lower[nlow] = i
+        nlow += 1
+
+    # Build upper hull, walking the same sorted buffer backwards
+    upper = np.empty(n, np.int64)
+    nup = 0
+    for i in range(n - 1, -1, -1):
+        while nup >= 2:
+            turn = _cross(
+                pts[upper[nup - 2], 0],
+                pts[upper[nup - 2], 1],
+                pts[upper[nup - 1], 0],
+                pts[upper[nup - 1], 1],
+                pts[i, 0],
+                pts[i, 1],
+            )
+            if turn > 0.0:
+                break
+            nup -= 1
+        upper[nup] = i
+        nup += 1
+
+    # Concatenate lower and upper to get full hull; omit last point of each
+    # chain because it's repeated at the start of the other chain.
+    return np.concatenate((lower[: nlow - 1], upper[: nup - 1]))
+
+
+def _monotone_chain_py(pts: np.ndarray) -> np.ndarray:
+    """Pure-Python :func:`_monotone_chain_nb`, used when no compiled kernel exists.
+
+    Works on plain lists with the cross product inlined and each point
+    unpacked once per test, which is far cheaper in the interpreter than
+    calling :func:`_cross` on NumPy scalars.
+    """
+    points = pts.tolist()
 
     # Build lower hull
-    lower: list[tuple[float, float]] = []
-    for p in unique_points:
-        while len(lower) >= 2 and _cross(lower[-2], lower[-1], p) <= 0:
+    lower: list[int] = []
+    for i, (p0, p1) in enumerate(points):
+        while len(lower) >= 2:
+            o0, o1 = points[lower[-2]]
+            a0, a1 = points[lower[-1]]
+            if (a0 - o0) * (p1 - o1) - (a1 - o1) * (p0 - o0) > 0:
+                break
             lower.pop()
-        lower.append(p)
+        lower.append(i)
 
     # Build upper hull
-    upper: list[tuple[float, float]] = []
-    for p in reversed(unique_points):
-        while len(upper) >= 2 and _cross(upper[-2], upper[-1], p) <= 0:
+    upper: list[int] = []
+    for i in range(len(points) - 1, -1, -1):
+        p0, p1 = points[i]
+        while len(upper) >= 2:
+            o0, o1 = points[upper[-2]]
+            a0, a1 = points[upper[-1]]
+            if (a0 - o0) * (p1 - o1) - (a1 - o1) * (p0 - o0) > 0:
+                break
             upper.pop()
-        upper.append(p)
+        upper.append(i)
+
+    return np.array(lower[:-1] + upper[:-1], dtype=np.int64)
 
-    # Concatenate lower and upper to get full hull; omit last point of each
-    # list because it's repeated at the start of the other list.
-    return lower[:-1] + upper[:-1]
+
+# Pick the hull kernel once: Numba if installed, then the compiled Cython
+# module (see chull.pyx) if it has been built, then pure Python
+if HAVE_NUMBA:
+    _monotone_chain = _monotone_chain_nb
+else:
+    try:
+        from chull import monotone_chain as _monotone_chain_cy
+    except ImportError:
+        _monotone_chain = _monotone_chain_py
+    else:
+        _monotone_chain = _monotone_chain_cy
+
+
+def _akl_toussaint_filter(pts: np.ndarray) -> np.ndarray:
+    """Drop points lying strictly inside the Akl–Toussaint extreme octagon.
+
+    The octagon's vertices are the points extreme in y, x - y, x, x + y
+    (minimum and maximum of each), taken in counter-clockwise order. Since
+    they all lie on the hull boundary, no point strictly inside the octagon
+    can be a hull vertex; everything on or outside its boundary is kept.
+    """
+    x = pts[:, 0]
+    y = pts[:, 1]
+    s = x + y
+    d = x - y
+    extrema = [
+        np.argmin(y),
+        np.argmax(d),
+        np.argmax(x),
+        np.argmax(s),
+        np.argmax(y),
+        np.argmin(d),
+        np.argmin(x),
+        np.argmin(s),
+    ]
+
+    # Collapse coincident consecutive extrema (including the wrap-around)
+    order: list[int] = []
+    for i in extrema:
+        if not order or i != order[-1]:
+            order.append(int(i))
+    if len(order) > 1 and order[0] == order[-1]:
+        order.pop()
+    if len(order) < 3:
+        return pts
+
+    # A point is strictly inside iff it is strictly left of every edge
+    inside = np.ones(len(pts), dtype=bool)
+    for k in range(len(order)):
+        o = pts[order[k - 1]]
+        a = pts[order[k]]
+        inside &= _cross_batch(o[0], o[1], a[0], a[1], x, y) > 0
+    return pts[~inside]
+
+
+def _as_points(points: ArrayLike) -> np.ndarray:
+    """Convert ``points`` to an ``(N, 2)`` float array, rejecting other shapes."""
+    pts = np.asarray(points, dtype=np.float64)
+    if pts.size == 0:
+        return pts.reshape(0, 2)
+    if pts.ndim != 2 or pts.shape[1] != 2:
+        raise ValueError(f"points must have shape (N, 2), got {pts.shape}")
+    return pts
+
+
+def compute_convex_hull(points: ArrayLike) -> np.ndarray:
+    """Compute the convex hull of a set of 2D points using Andrew's monotone chain.
+
+    ``points`` may be a sequence of ``(x, y)`` pairs or an ``(N, 2)`` array.
+    Returns the hull vertices as an ``(M, 2)`` float array in counter-clockwise
+    order without repeating the first point at the end. If there are fewer
+    than 3 unique points, the returned array is the unique points themselves.
+    Raises ``ValueError`` if ``points`` is not shaped as ``(N, 2)``.
+    """
+    pts = _as_points(points)
+    if len(pts) == 0:
+        return pts
+
+    # Discard interior points up front so the sort only sees the residual
+    pts = _akl_toussaint_filter(pts)
+
+    # Sort lexicographically (by x, then y), then drop adjacent duplicates
+    sorted_points = pts[np.lexsort((pts[:, 1], pts[:, 0]))]
+    keep = np.concatenate(
+        ([True], np.any(sorted_points[1:] != sorted_points[:-1], axis=1))
+    )
+    unique_points = sorted_points[keep]
+    if len(unique_points) <= 1:
+        return unique_points
+
+    return unique_points[_monotone_chain(unique_points)]
 
 
 def draw_points_and_hull(
-    points: list[tuple[float, float]],
+    points: ArrayLike,
     show_hull: bool,
     output_path: str,
+    hull: np.ndarray | None = None,
 ) -> None:
-    """Draw points (and optionally their convex hull) to an image file."""
-    if not points:
+    """Draw points (and optionally their convex hull) to an image file.
+
+    ``hull`` may be a precomputed result of :func:`compute_convex_hull` for
+    ``points``; it is only computed here when needed and not supplied.
+    """
+    pts = _as_points(points)
+    if len(pts) == 0:
         raise ValueError("points list must not be empty")
 
-    hull: list[tuple[float, float]] = compute_convex_hull(points) if show_hull else []
+    if not show_hull:
+        hull = np.empty((0, 2))
+    elif hull is None:
+        hull = compute_convex_hull(pts)
 
-    fig, ax = plt.subplots(figsize=(6, 6))
+    fig, ax = plt.subplots(figsize=(6, 6), dpi=150)
     ax.set_facecolor("white")
 
     # Plot all points as medium-sized black dots
-    xs, ys = zip(*points)
-    ax.scatter(xs, ys, s=50, color="black", zorder=2)
+    ax.scatter(pts[:, 0], pts[:, 1], s=50, color="black", zorder=2)
 
     # Draw convex hull polygon if requested and we have at least a triangle
     if show_hull and len(hull) >= 3:
-        hx, hy = zip(*hull)
-        hx_list = list(hx)
-        hy_list = list(hy)
         # Close the polygon by repeating the first point at the end
-        hx_list.append(hx_list[0])
-        hy_list.append(hy_list[0])
+        closed = np.concatenate((hull, hull[:1]))
+        hx = closed[:, 0]
+        hy = closed[:, 1]
 
         # Light filled polygon with a solid border
         ax.fill(
-            hx_list,
-            hy_list,
+            hx,
+            hy,
             facecolor="tab:blue",
             alpha=0.15,
             edgecolor="none",
             zorder=1,
         )
         ax.plot(
-            hx_list,
-            hy_list,
+            hx,
+            hy,
             color="tab:blue",
             linewidth=2.0,
             zorder=3,
         )
 
-    # Set a small margin around the unit square so points and hull are not clipped
+    # Set a small margin around the unit square so points and hull are not
+    # clipped; the axes fill the whole figure, so this is the image's border
     margin = 0.05
     ax.set_xlim(-margin, 1.0 + margin)
     ax.set_ylim(-margin, 1.0 + margin)
     ax.set_aspect("equal")
     ax.axis("off")
 
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=150, bbox_inches="tight")
+    fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
+    # Figure is created at output DPI; write from the canvas, bypassing savefig
+    with open(output_path, "wb") as f:
+        fig.canvas.print_png(f)
     plt.close(fig)
 
 
@@ -109,11 +296,11 @@ def main() -> None:
     if n_points <= 0:
         raise ValueError("n_points must be positive")
 
-    # Generate a single random point set to use for both images
-    points: list[tuple[float, float]] = [
-        (random.uniform(0.0, 1.0), random.uniform(0.0, 1.0))
-        for _ in range(n_points)
-    ]
+    # Generate a single random point set in the unit square for both images
+    points = np.random.default_rng().random((n_points, 2))
+
+    # Compute the hull once up front rather than inside the drawing call
+    hull = compute_convex_hull(points)
 
     # Image without the solution (points only)
     points_only_file = "convex_hull_points.png"
@@ -122,7 +309,7 @@ def main() -> None:
 
     # Image with the convex hull solution
     hull_file = "convex_hull.png"
-    draw_points_and_hull(points, show_hull=True, output_path=hull_file)
+    draw_points_and_hull(points, show_hull=True, output_path=hull_file, hull=hull)
     print(f"Convex hull (with solution) graph saved to {hull_file}")
 
 
@@ -1,7 +1,26 @@
-import random
+import matplotlib
+
+matplotlib.use("Agg")
 
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+from matplotlib.collections import LineCollection, PatchCollection, PathCollection
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D
+
+
+def _grid_edge_endpoints(n_rows: int, n_cols: int) -> tuple[np.ndarray, np.ndarray]:
+    """Source and target node arrays of all grid edges.
+
+    Horizontal edges come first in row-major order, matching ``w_right``,
+    followed by vertical edges matching ``w_down``.
+    """
+    idx = np.arange(n_rows * n_cols).reshape(n_rows, n_cols)
+    us = np.concatenate((idx[:, :-1].ravel(), idx[:-1].ravel()))
+    vs = np.concatenate((idx[:, 1:].ravel(), idx[1:].ravel()))
+    return us, vs
 
 
 def build_square_graph(n_rows: int = 6, n_cols: int = 6) -> nx.DiGraph:
@@ -15,6 +34,9 @@ def build_square_graph(n_rows: int = 6, n_cols: int = 6) -> nx.DiGraph:
     - Directed edges:
         - Horizontal edges: left -> right
         - Vertical edges: top -> down
+    - Edge weights are also stored as arrays on ``g.graph``:
+        ``w_right[r, c]`` for (r, c) -> (r, c + 1) and
+        ``w_down[r, c]`` for (r, c) -> (r + 1, c).
     """
     g = nx.DiGraph()
 
@@ -22,231 +44,343 @@ def build_square_graph(n_rows: int = 6, n_cols: int = 6) -> nx.DiGraph:
     num_nodes = n_rows * n_cols
     g.add_nodes_from(range(num_nodes))
 
-    def idx(r: int, c: int) -> int:
-        return r * n_cols + c
+    # Draw all weights in one go, then add directed edges between
+    # horizontally (left -> right) and vertically (top -> down) adjacent nodes
+    rng = np.random.default_rng()
+    w_right = rng.integers(1, 11, size=(n_rows, max(n_cols - 1, 0)))
+    w_down = rng.integers(1, 11, size=(max(n_rows - 1, 0), n_cols))
 
-    # Add directed edges between horizontally and vertically adjacent nodes
-    for r in range(n_rows):
-        for c in range(n_cols):
-            u = idx(r, c)
+    us, vs = _grid_edge_endpoints(n_rows, n_cols)
+    ws = np.concatenate((w_right.ravel(), w_down.ravel()))
+    g.add_weighted_edges_from(zip(us.tolist(), vs.tolist(), ws.tolist()))
 
-            # Horizontal: left -> right
-            if c < n_cols - 1:
-                v = idx(r, c + 1)
-                weight = random.randint(1, 10)
-                g.add_edge(u, v, weight=weight)
-
-            # Vertical: top -> down
-            if r < n_rows - 1:
-                v = idx(r + 1, c)
-                weight = random.randint(1, 10)
-                g.add_edge(u, v, weight=weight)
-
-    # Store grid shape on the graph for drawing
+    # Store grid shape on the graph for drawing, and weights for grid algorithms
     g.graph["n_rows"] = n_rows
     g.graph["n_cols"] = n_cols
+    g.graph["w_right"] = w_right
+    g.graph["w_down"] = w_down
 
     return g
 
 
-def draw_graph(
-    g: nx.DiGraph,
-    output_path: str = "square_graph.png",
-    highlight_edges: set[tuple[int, int]] | None = None,
-    use_arrows: bool = True,
-) -> None:
-    """Draw the directed, weighted graph as a square and save to an image file.
+def grid_shortest_path(g: nx.DiGraph) -> list[int]:
+    """Shortest path from the top-left to the bottom-right node of a square graph.
 
-    Requirements:
-    - Filled circular vertices
-    - Straight edges
-    - Arrow tip gently touching the circle (not covered by the node)
-    - Edge weights placed just outside the edge, text not rotated
+    Since every edge points right or down, the distances follow a row-major
+    dynamic program over the ``w_right``/``w_down`` arrays stored by
+    :func:`build_square_graph`. Within a row, reaching column ``c`` means
+    dropping in from above at some column ``k <= c`` and walking right, so
+    ``dist[c] = prefix[c] + min(above[k] - prefix[k] for k <= c)`` is one
+    ``np.minimum.accumulate`` per row.
+    """
+    n_rows = g.graph["n_rows"]
+    n_cols = g.graph["n_cols"]
+    w_right = g.graph["w_right"]
+    w_down = g.graph["w_down"]
+
+    # from_above[r, c] is True if the best way into (r, c) is from (r - 1, c);
+    # the top row can only be reached by walking right from the source
+    from_above = np.zeros((n_rows, n_cols), dtype=bool)
+    from_above[0, 0] = True
+    dist = np.concatenate(([0.0], np.cumsum(w_right[0])))
+    for r in range(1, n_rows):
+        above = dist + w_down[r - 1]
+        prefix = np.concatenate(([0.0], np.cumsum(w_right[r])))
+        entry = above - prefix
+        best_entry = np.minimum.accumulate(entry)
+        from_above[r] = entry <= best_entry
+        dist = prefix + best_entry
+
+    # Walk the predecessor flags back from the bottom-right corner
+    r, c = n_rows - 1, n_cols - 1
+    path = [r * n_cols + c]
+    while r > 0 or c > 0:
+        if from_above[r, c]:
+            r -= 1
+        else:
+            c -= 1
+        path.append(r * n_cols + c)
+    path.reverse()
+    return path
+
+
+def grid_minimum_spanning_tree(g: nx.DiGraph) -> set[tuple[int, int]]:
+    """Kruskal minimum spanning tree of a square graph, ignoring edge direction.
+
+    Works directly on the ``w_right``/``w_down`` arrays stored by
+    :func:`build_square_graph`: edges are ordered with one stable argsort
+    and joined with an array-backed union-find. Returns the tree's edges in
+    the graph's own (directed) orientation.
+    """
+    n_rows = g.graph["n_rows"]
+    n_cols = g.graph["n_cols"]
+    us, vs = (ends.tolist() for ends in _grid_edge_endpoints(n_rows, n_cols))
+    weights = np.concatenate((g.graph["w_right"].ravel(), g.graph["w_down"].ravel()))
+    order = np.argsort(weights, kind="stable").tolist()
+
+    parent = list(range(n_rows * n_cols))
+
+    def find(x: int) -> int:
+        # Path halving keeps the trees shallow without recursion
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    mst_edges: set[tuple[int, int]] = set()
+    for i in order:
+        root_u = find(us[i])
+        root_v = find(vs[i])
+        if root_u != root_v:
+            parent[root_u] = root_v
+            mst_edges.add((us[i], vs[i]))
+            if len(mst_edges) == n_rows * n_cols - 1:
+                break
+    return mst_edges
+
+
+def _build_scene(g: nx.DiGraph) -> dict:
+    """Create the figure and every artist needed to draw ``g``.
+
+    Returns a dict with the figure and axes, the node, edge and edge-label
+    collections, and the edge list ``(u, v)`` in collection order. Edges are
+    created in their default (non-highlighted) style; :func:`draw_graph`
+    restyles them, so one scene can be saved several times.
     """
     # Grid layout based on stored dimensions
     n_rows = g.graph.get("n_rows", 6)
     n_cols = g.graph.get("n_cols", 6)
 
-    # Map node index -> (x, y) in data coords
-    pos: dict[int, tuple[float, float]] = {}
-    for n in g.nodes():
-        r = n // n_cols
-        c = n % n_cols
-        # x increases to the right, y decreases downward; we want top row to have highest y
-        x = float(c)
-        y = float((n_rows - 1) - r)
-        pos[n] = (x, y)
-
-    # Increase figure size by ~20% so nodes and labels have more room
-    fig, ax = plt.subplots(figsize=(6, 6))
-    ax.set_aspect("equal")
-    ax.axis("off")
+    # Node index -> (px[n], py[n]) in data coords; x increases to the right,
+    # y decreases downward so the top row has the highest y
+    rows = np.arange(n_rows).reshape(n_rows, 1)
+    cols = np.arange(n_cols).reshape(1, n_cols)
+    px = np.broadcast_to(cols, (n_rows, n_cols)).ravel().astype(float)
+    py = float(n_rows - 1) - np.broadcast_to(rows, (n_rows, n_cols)).ravel()
 
-    # Add a small margin so circles are fully visible (not cut off)
+    # Add a small margin so circles are fully visible (not cut off), and a
+    # wider one on the left and top where the edge labels sit. The axes fill
+    # the whole figure, so these limits are the saved image's bounds.
     margin = 0.2
+    label_margin = 0.4
     max_x = float(n_cols - 1)
     max_y = float(n_rows - 1)
-    ax.set_xlim(-margin, max_x + margin)
-    ax.set_ylim(-margin, max_y + margin)
+
+    # Size the figure to the data's aspect ratio (longest side 6 in) so
+    # non-square grids stay tight without a bounding-box probe render
+    span_x = max_x + margin + label_margin
+    span_y = max_y + margin + label_margin
+    span = max(span_x, span_y)
+    fig, ax = plt.subplots(figsize=(6 * span_x / span, 6 * span_y / span), dpi=150)
+    ax.set_aspect("equal")
+    ax.axis("off")
+    ax.set_xlim(-label_margin, max_x + margin)
+    ax.set_ylim(-margin, max_y + label_margin)
 
     # Radius of nodes in data coordinates (slightly larger so circles are more visible)
     node_radius = 0.12
 
-    # Draw filled nodes (circles) without inner values
-    for n, (x, y) in pos.items():
-        circle = plt.Circle(
-            (x, y),
-            radius=node_radius,
-            facecolor="lightgray",
-            edgecolor="black",
-            linewidth=1.5,
-            zorder=2,
-        )
-        ax.add_patch(circle)
-
-    # Draw edges (optionally with arrow tips) touching the circle
+    # Draw filled nodes (circles) without inner values, as a single collection
+    nodes = PatchCollection(
+        [plt.Circle(xy, radius=node_radius) for xy in zip(px, py)],
+        facecolor="lightgray",
+        edgecolor="black",
+        linewidth=1.5,
+        zorder=2,
+    )
+    ax.add_collection(nodes)
+
+    # Edges are batched into one line collection; arrow tips are a single
+    # quiver whose heads end exactly where the lines meet the circles.
     # Slightly smaller offset so labels sit closer to edges
     label_offset = 0.2
+    arrow_length = 0.15
+
+    # Edge geometry for all edges at once
+    positions = np.column_stack((px, py))
+    edge_index = np.array(g.edges(), dtype=np.int64).reshape(-1, 2)
+    p1 = positions[edge_index[:, 0]]
+    p2 = positions[edge_index[:, 1]]
+    delta = p2 - p1
+    length = np.linalg.norm(delta, axis=1, keepdims=True)
+    nonzero = length[:, 0] > 0
+    edge_index = edge_index[nonzero]
+    p1, p2, delta = p1[nonzero], p2[nonzero], delta[nonzero]
+    directions = delta / length[nonzero]
+
+    # Start/end just outside the node circles
+    start = p1 + directions * node_radius
+    end = p2 - directions * node_radius
+    segments = np.stack((start, end), axis=1)
+    edges: list[tuple[int, int]] = list(map(tuple, edge_index.tolist()))
+    weights: list[int] = [g.edges[edge]["weight"] for edge in edges]
+
+    # Compute label position slightly outside the edge, using standard
+    # notation for label placement:
+    # - Horizontal edges: labels above (top-sided)
+    # - Vertical edges: labels to the left (left-sided)
+    label_offsets = (start + end) / 2.0
+    horizontal = np.abs(delta[:, 1]) < 1e-6
+    vertical = ~horizontal & (np.abs(delta[:, 0]) < 1e-6)
+    label_offsets[horizontal, 1] += label_offset
+    label_offsets[vertical, 0] -= label_offset
+
+    # Straight edges (above nodes so they meet the circle outline). Plain and
+    # highlighted edges are separate collections holding every segment;
+    # draw_graph hides each edge in whichever one does not apply, so the
+    # highlighted edges keep drawing above the rest.
+    edge_lines = LineCollection(segments, colors="gray", linewidths=1.5, zorder=4)
+    highlight_lines = LineCollection(
+        segments, colors="none", linewidths=2.8, zorder=5
+    )
+    ax.add_collection(edge_lines)
+    ax.add_collection(highlight_lines)
+
+    # Arrow tips, drawn as heads only: each vector is exactly one head long.
+    # Highlighted heads use a wider shaft (head sizes are multiples of it) to
+    # thicken with their lines, with the head length kept at arrow_length.
+    arrow_tails = segments[:, 1] - directions * arrow_length
+    arrow_heads, highlight_heads = (
+        ax.quiver(
+            arrow_tails[:, 0],
+            arrow_tails[:, 1],
+            directions[:, 0] * arrow_length,
+            directions[:, 1] * arrow_length,
+            angles="xy",
+            scale_units="xy",
+            scale=1,
+            units="xy",
+            width=arrow_length / head_length,
+            headwidth=5,
+            headlength=head_length,
+            headaxislength=0.9 * head_length,
+            color=color,
+            zorder=zorder,
+        )
+        for head_length, color, zorder in ((5, "gray", 4), (4, "none", 5))
+    )
+
+    # Edge weights as one collection of glyph outlines, one cached path per
+    # distinct weight, centred on the label position and kept upright
+    glyphs: dict[int, Path] = {}
+    for weight in set(weights):
+        text_path = TextPath((0, 0), str(weight), size=10)
+        center = text_path.get_extents().get_points().mean(axis=0)
+        glyphs[weight] = Path(text_path.vertices - center, text_path.codes)
+    edge_labels = PathCollection(
+        [glyphs[weight] for weight in weights],
+        offsets=label_offsets,
+        offset_transform=ax.transData,
+        facecolor="dimgray",
+        edgecolor="none",
+        zorder=5,
+    )
+    # Glyph paths are in points; scale them to pixels at the output DPI
+    edge_labels.set_transform(Affine2D().scale(1 / 72) + fig.dpi_scale_trans)
+    ax.add_collection(edge_labels)
+
+    fig.subplots_adjust(left=0, right=1, bottom=0, top=1)
+
+    return {
+        "fig": fig,
+        "ax": ax,
+        "nodes": nodes,
+        "edges": edges,
+        "edge_lines": edge_lines,
+        "highlight_lines": highlight_lines,
+        "arrow_heads": arrow_heads,
+        "highlight_heads": highlight_heads,
+        "edge_labels": edge_labels,
+    }
+
+
+def draw_graph(
+    g: nx.DiGraph,
+    output_path: str = "square_graph.png",
+    highlight_edges: set[tuple[int, int]] | None = None,
+    use_arrows: bool = True,
+    scene: dict | None = None,
+) -> None:
+    """Draw the directed, weighted graph as a square and save to an image file.
+
+    Requirements:
+    - Filled circular vertices
+    - Straight edges
+    - Arrow tip gently touching the circle (not covered by the node)
+    - Edge weights placed just outside the edge, text not rotated
+
+    ``scene`` is an optional result of :func:`_build_scene` for ``g``. Passing
+    one reuses its figure and artists instead of creating them; the caller
+    then owns the figure and must close it.
+    """
+    owns_scene = scene is None
+    if scene is None:
+        scene = _build_scene(g)
 
     highlight_edges = highlight_edges or set()
 
-    for u, v, data in g.edges(data=True):
-        x1, y1 = pos[u]
-        x2, y2 = pos[v]
-
-        dx = x2 - x1
-        dy = y2 - y1
-        length = (dx ** 2 + dy ** 2) ** 0.5
-        if length == 0:
-            continue
-
-        ux = dx / length
-        uy = dy / length
-
-        # Start/end just outside the node circles
-        start_x = x1 + ux * node_radius
-        start_y = y1 + uy * node_radius
-        end_x = x2 - ux * node_radius
-        end_y = y2 - uy * node_radius
-
-        # Choose style: highlighted edges are thicker and darker
-        if (u, v) in highlight_edges:
-            edge_color = "black"
-            edge_width = 2.8
-            edge_zorder = 5
-        else:
-            edge_color = "gray"
-            edge_width = 1.5
-            edge_zorder = 4
-
-        if use_arrows:
-            # Draw arrow (above nodes so tip is visible)
-            ax.annotate(
-                "",
-                xy=(end_x, end_y),
-                xytext=(start_x, start_y),
-                arrowprops=dict(
-                    arrowstyle="->",
-                    color=edge_color,
-                    linewidth=edge_width,
-                    mutation_scale=20,  # slightly larger arrow tip
-                    shrinkA=0,
-                    shrinkB=0,
-                ),
-                zorder=edge_zorder,
-            )
-        else:
-            # Draw plain straight line (no arrowheads)
-            ax.plot(
-                [start_x, end_x],
-                [start_y, end_y],
-                color=edge_color,
-                linewidth=edge_width,
-                zorder=edge_zorder,
-            )
-
-        # Compute label position slightly outside the edge
-        mid_x = (start_x + end_x) / 2.0
-        mid_y = (start_y + end_y) / 2.0
-
-        label_x, label_y = mid_x, mid_y
-
-        # Standard notation for label placement:
-        # - Horizontal edges: labels above (top-sided)
-        # - Vertical edges: labels to the left (left-sided)
-        if abs(dy) < 1e-6:
-            # Horizontal edge -> move label upward
-            label_y += label_offset
-        elif abs(dx) < 1e-6:
-            # Vertical edge -> move label left
-            label_x -= label_offset
-
-        weight = data.get("weight")
-        ax.text(
-            label_x,
-            label_y,
-            str(weight),
-            fontsize=10,
-            color="dimgray",
-            ha="center",
-            va="center",
-            rotation=0,  # keep text upright (no rotation)
-            zorder=5,
-        )
+    # Choose style: highlighted edges are thicker and darker, drawn from the
+    # highlight collections; each edge is hidden in the other pair
+    highlighted = np.array([edge in highlight_edges for edge in scene["edges"]])
+    plain_colors = np.where(highlighted, "none", "gray")
+    highlight_colors = np.where(highlighted, "black", "none")
+
+    scene["edge_lines"].set_color(plain_colors)
+    scene["highlight_lines"].set_color(highlight_colors)
+
+    scene["arrow_heads"].set_color(plain_colors)
+    scene["highlight_heads"].set_color(highlight_colors)
+    scene["arrow_heads"].set_visible(use_arrows)
+    scene["highlight_heads"].set_visible(use_arrows)
 
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    fig = scene["fig"]
+    # Figure is created at output DPI; write from the canvas, bypassing savefig
+    with open(output_path, "wb") as f:
+        fig.canvas.print_png(f)
+    if owns_scene:
+        plt.close(fig)
 
 
 def main() -> None:
     g = build_square_graph()
 
+    # Build the figure once and restyle it for each image
+    scene = _build_scene(g)
+
     # Base grid image with arrows
     base_file = "square_graph.png"
-    draw_graph(g, base_file, use_arrows=True)
+    draw_graph(g, base_file, use_arrows=True, scene=scene)
     print(f"Base graph saved to {base_file}")
 
     # Additional base image without arrow tips
     base_no_arrows_file = "square_graph_no_arrows.png"
-    draw_graph(g, base_no_arrows_file, use_arrows=False)
+    draw_graph(g, base_no_arrows_file, use_arrows=False, scene=scene)
     print(f"Base graph without arrows saved to {base_no_arrows_file}")
 
-    # Dijkstra shortest path from top-left (0) to bottom-right (last node)
-    n_rows = g.graph["n_rows"]
-    n_cols = g.graph["n_cols"]
-    source = 0
-    target = n_rows * n_cols - 1
-
-    try:
-        dijkstra_path = nx.shortest_path(g, source=source, target=target, weight="weight")
-        dijkstra_edges: set[tuple[int, int]] = set(
-            (dijkstra_path[i], dijkstra_path[i + 1]) for i in range(len(dijkstra_path) - 1)
-        )
-    except nx.NetworkXNoPath:
-        dijkstra_edges = set()
+    # Shortest path from top-left (0) to bottom-right (last node); the grid
+    # DAG makes a row-major DP equivalent to running Dijkstra
+    dijkstra_path = grid_shortest_path(g)
+    dijkstra_edges: set[tuple[int, int]] = set(zip(dijkstra_path, dijkstra_path[1:]))
 
     dijkstra_file = "square_graph_dijkstra.png"
     # Keep arrows on the Dijkstra shortest path image
-    draw_graph(g, dijkstra_file, highlight_edges=dijkstra_edges, use_arrows=True)
+    draw_graph(
+        g, dijkstra_file, highlight_edges=dijkstra_edges, use_arrows=True, scene=scene
+    )
     print(f"Dijkstra shortest-path graph saved to {dijkstra_file}")
 
-    # Minimum spanning tree using Kruskal on the undirected version
-    undirected = g.to_undirected()
-    mst = nx.minimum_spanning_tree(undirected, weight="weight")
-
-    mst_edges: set[tuple[int, int]] = set()
-    for u, v in mst.edges():
-        if g.has_edge(u, v):
-            mst_edges.add((u, v))
-        elif g.has_edge(v, u):
-            mst_edges.add((v, u))
+    # Minimum spanning tree using Kruskal, treating the grid as undirected
+    mst_edges = grid_minimum_spanning_tree(g)
 
     mst_file = "square_graph_mst.png"
     # MST image without arrow tips
-    draw_graph(g, mst_file, highlight_edges=mst_edges, use_arrows=False)
+    draw_graph(
+        g, mst_file, highlight_edges=mst_edges, use_arrows=False, scene=scene
+    )
     print(f"Kruskal MST graph saved to {mst_file}")
 
+    plt.close(scene["fig"])
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,20 @@
+"""Build the optional Cython hull kernel in place.
+
+    python setup.py build_ext --inplace
+"""
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+setup(
+    name="python-graph",
+    ext_modules=cythonize(
+        [
+            Extension(
+                "chull",
+                ["chull.pyx"],
+                extra_compile_args=["-O3", "-march=native"],
+            )
+        ],
+        language_level=3,
+    ),
+)